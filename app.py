@@ -1,9 +1,17 @@
 # Enhanced Flask CMP Server with Multi-Recipient Professional Voice SMS & Email Processing
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+import gzip
+import hashlib
+import random
+import threading
+import time
 import smtplib
 import ssl
 from email.mime.text import MIMEText
@@ -11,27 +19,122 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Mapping
+from types import MappingProxyType
 import re
 import concurrent.futures
+import copy
+import functools
+import importlib.util
+import atexit
+import logging
+import queue
+import signal
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
+
+# Twilio REST API client; the (heavy) import is deferred until credentials are configured
+TWILIO_AVAILABLE = importlib.util.find_spec("twilio") is not None
+if not TWILIO_AVAILABLE:
+    print("Twilio library not installed. Run: pip install twilio")
 
-# Import Twilio REST API client
+# Import orjson for faster JSON encoding/decoding (falls back to stdlib json)
 try:
-    from twilio.rest import Client
-    TWILIO_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TWILIO_AVAILABLE = False
-    print("Twilio library not installed. Run: pip install twilio")
+    ORJSON_AVAILABLE = False
+    print("orjson not installed, using stdlib json. Run: pip install orjson")
+
+# Import phonenumbers for region-aware phone validation/E.164 formatting (falls back to US heuristics)
+try:
+    import phonenumbers
+    PHONENUMBERS_AVAILABLE = True
+except ImportError:
+    PHONENUMBERS_AVAILABLE = False
+
+# Import brotli for precompressed static responses (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson so jsonify() and request.json skip stdlib json"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+# ----- Logging -----
+# Request threads only enqueue log records; a QueueListener thread per process does the
+# blocking writes to stdout, so handlers never contend on the stdout lock.
+log = logging.getLogger("smart_ai_agent")
+log.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+log.propagate = False
+log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+log.addHandler(QueueHandler(log_queue))
+log_stream_handler = logging.StreamHandler(sys.stdout)
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+log_listener: Optional[QueueListener] = None
+log_listener_pid: Optional[int] = None
+
+def start_log_listener() -> None:
+    """Start this process's log writer thread (threads don't survive a fork, so workers start their own)"""
+    global log_listener, log_listener_pid
+    if log_listener_pid == os.getpid():
+        return
+    log_listener = QueueListener(log_queue, log_stream_handler)
+    log_listener.start()
+    log_listener_pid = os.getpid()
+
+def stop_log_listener() -> None:
+    """Flush queued log records and stop the writer thread"""
+    if log_listener is not None and log_listener_pid == os.getpid():
+        log_listener.stop()
+
+start_log_listener()
+atexit.register(stop_log_listener)
 
 app = Flask(__name__)
-CORS(app)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
+# CORS only applies to the API routes; the page shell, manifest, icon and service worker
+# are same-origin, so they skip the header work. Preflights are cached for a day.
+CORS_API_ROUTES = r"^/(?!$|manifest\.json$|sw\.js$|icon\.svg$|static/)"
+CORS(app, resources={CORS_API_ROUTES: {"origins": os.getenv("CORS_ORIGINS", "*").split(",")}}, max_age=86400)
 
 CONFIG = {
     "provider": "claude",
     "claude_api_key": os.getenv("CLAUDE_API_KEY", ""),
+    "claude_model": os.getenv("CLAUDE_MODEL", "claude-3-haiku-20240307"),
+    "claude_max_concurrency": int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8")),
+    "claude_max_retries": int(os.getenv("CLAUDE_MAX_RETRIES", "4")),
+    "claude_cache_size": int(os.getenv("CLAUDE_CACHE_SIZE", "4096")),
+    "claude_cache_ttl": float(os.getenv("CLAUDE_CACHE_TTL", "3600")),
     "twilio_account_sid": os.getenv("TWILIO_ACCOUNT_SID", ""),
     "twilio_auth_token": os.getenv("TWILIO_AUTH_TOKEN", ""),
     "twilio_phone_number": os.getenv("TWILIO_PHONE_NUMBER", ""),
+    "default_phone_region": os.getenv("DEFAULT_PHONE_REGION", "US"),
     # Email configuration - Network Solutions defaults
     "smtp_server": os.getenv("SMTP_SERVER", "mail.networksolutions.com"),
     "smtp_port": int(os.getenv("SMTP_PORT", "587")),
@@ -87,6 +190,19 @@ Only include fields relevant to the action.
 Do not add extra commentary.
 """
 
+# Sent as a system block marked for Anthropic prompt caching, so the static
+# instructions are served from the prompt cache instead of re-processed per call
+INSTRUCTION_SYSTEM = [
+    {"type": "text", "text": INSTRUCTION_PROMPT, "cache_control": {"type": "ephemeral"}}
+]
+
+BATCH_INSTRUCTION_PROMPT = """
+You will receive several numbered commands. Respond with exactly one JSON object per command,
+one object per line, in the same order as the commands. Do not number the lines or add any other text.
+"""
+
+MAX_BATCH_COMMANDS = 20
+
 MESSAGE_ENHANCEMENT_PROMPT = """
 You are a professional communication assistant. Your task is to enhance messages to make them clear, professional, and grammatically correct while preserving the original meaning and intent.
 
@@ -300,6 +416,7 @@ class TwilioClient:
         
         if TWILIO_AVAILABLE and self.account_sid and self.auth_token:
             try:
+                from twilio.rest import Client
                 self.client = Client(self.account_sid, self.auth_token)
                 print("✅ Twilio client initialized successfully")
             except Exception as e:
@@ -307,6 +424,19 @@ class TwilioClient:
         else:
             print("⚠️ Twilio not configured or library missing")
     
+    def warm_connection(self) -> None:
+        """Fetch the account in the background so the first SMS reuses an open Twilio connection"""
+        if not self.client:
+            return
+        
+        def warm():
+            try:
+                self.client.api.accounts(self.account_sid).fetch()
+            except Exception as e:
+                log.warning("[TWILIO] Connection warm-up failed: %s", e)
+        
+        threading.Thread(target=warm, name="twilio-warmup", daemon=True).start()
+    
     def send_sms(self, to: str, message: str) -> Dict[str, Any]:
         """Send SMS via Twilio REST API"""
         if not self.client:
@@ -355,47 +485,340 @@ class TwilioClient:
 twilio_client = TwilioClient()
 email_client = EmailClient()
 
+# ----- Claude HTTP Session -----
+# One pooled session for every Claude call so keep-alive connections are reused
+# instead of paying DNS + TCP + TLS setup on each request.
+CLAUDE_API_URL = "https://api.anthropic.com/v1/messages"
+CLAUDE_HEADERS = {
+    "x-api-key": CONFIG["claude_api_key"],
+    "anthropic-version": "2023-06-01",
+    "content-type": "application/json"
+}
+CLAUDE_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+# Rate-limit (429) and overloaded (529) responses are retried by stream_claude_text
+# with Retry-After aware backoff; the adapter only retries connection errors and 5xx.
+CLAUDE_RATE_LIMIT_STATUSES = frozenset({429, 529})
+CLAUDE_MAX_BACKOFF = 30.0  # seconds
+
+claude_session = requests.Session()
+claude_session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=128,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"})
+    )
+))
+atexit.register(claude_session.close)
+
+def warm_claude_connection() -> None:
+    """Open a pooled TLS connection to Anthropic in the background so the first command skips the handshake"""
+    if not CONFIG["claude_api_key"]:
+        return
+
+    def warm():
+        try:
+            claude_session.head("https://api.anthropic.com", timeout=CLAUDE_TIMEOUT)
+        except requests.RequestException as e:
+            log.warning("[CLAUDE] Connection warm-up failed: %s", e)
+
+    threading.Thread(target=warm, name="claude-warmup", daemon=True).start()
+
+# Caps in-flight Claude requests per process so bursts don't trip Anthropic's rate limits
+claude_semaphore = threading.BoundedSemaphore(CONFIG["claude_max_concurrency"])
+
+def claude_retry_delay(res: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited Claude request"""
+    try:
+        delay = float(res.headers.get("retry-after", ""))
+    except ValueError:
+        delay = 2 ** attempt + random.uniform(0, 0.5)
+    return min(delay, CLAUDE_MAX_BACKOFF)
+
+def stream_claude_text(payload: bytes):
+    """Yield text deltas from a streaming (SSE) Claude Messages API call"""
+    with claude_semaphore:
+        for attempt in range(CONFIG["claude_max_retries"] + 1):
+            res = claude_session.post(CLAUDE_API_URL, headers=CLAUDE_HEADERS, data=payload,
+                                      timeout=CLAUDE_TIMEOUT, stream=True)
+            if res.status_code not in CLAUDE_RATE_LIMIT_STATUSES or attempt == CONFIG["claude_max_retries"]:
+                break
+            delay = claude_retry_delay(res, attempt)
+            res.close()
+            log.warning("[CLAUDE] Rate limited (%s), retrying in %.1fs", res.status_code, delay)
+            time.sleep(delay)
+
+        yield from read_claude_stream(res)
+
+def log_prompt_cache_usage(usage: Dict[str, Any]) -> None:
+    """Log how many prompt tokens were read from or written to Anthropic's prompt cache"""
+    cache_read = usage.get("cache_read_input_tokens", 0)
+    cache_write = usage.get("cache_creation_input_tokens", 0)
+    if cache_read or cache_write:
+        log.info("[CLAUDE] Prompt cache: %s tokens read, %s tokens written", cache_read, cache_write)
+
+def read_claude_stream(res: requests.Response):
+    """Parse SSE events from a Claude response, yielding text deltas"""
+    with res:
+        if res.status_code != 200:
+            try:
+                message = json_loads(res.content)["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                message = res.text[:200]
+            raise RuntimeError(f"Claude API error ({res.status_code}): {message}")
+
+        # Only text deltas, the opening usage report, the stop reason and errors are
+        # decoded; ping, content_block_start and the like are skipped by their SSE event name
+        event_name = b""
+        for line in res.iter_lines():
+            if line.startswith(b"event: "):
+                event_name = line[7:]
+            elif not line.startswith(b"data: "):
+                continue
+            elif event_name == b"content_block_delta":
+                yield json_loads(line[6:])["delta"].get("text", "")
+            elif event_name == b"message_start":
+                log_prompt_cache_usage(json_loads(line[6:])["message"].get("usage", {}))
+            elif event_name == b"message_delta":
+                # A cut-off reply must not be sent on or cached as if it were complete
+                if json_loads(line[6:])["delta"].get("stop_reason") == "max_tokens":
+                    raise RuntimeError("Claude response truncated at max_tokens")
+            elif event_name == b"message_stop":
+                return
+            elif event_name == b"error":
+                error = json_loads(line[6:]).get("error", {})
+                raise RuntimeError(f"Claude stream error: {error.get('message', 'unknown error')}")
+
+def parse_action_json(raw_text: str) -> Dict[str, Any]:
+    """Parse Claude's action JSON, tolerating markdown fences or surrounding prose"""
+    text = raw_text.strip()
+    if text.startswith("```"):
+        text = text.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+    try:
+        parsed = json_loads(text)
+    except ValueError:
+        # Fall back to the outermost {...} span when Claude adds commentary
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise ValueError(f"Claude response is not JSON: {raw_text[:200]}")
+        parsed = json_loads(text[start:end + 1])
+
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("action"), str):
+        raise ValueError(f"Claude response has no action: {raw_text[:200]}")
+    return parsed
+
+def collect_action_text(chunks) -> str:
+    """Join streamed text up to the end of the first complete top-level JSON object"""
+    parts = []
+    depth, in_string, escaped, complete = 0, False, False, False
+    try:
+        for chunk in chunks:
+            if complete:
+                # Trailing commentary after the action: stop instead of waiting for it.
+                # Without it the stream ends right away and the connection stays pooled.
+                if chunk:
+                    break
+                continue
+            for i, ch in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}" and depth:
+                    depth -= 1
+                    if depth == 0:
+                        complete = True
+                        chunk = chunk[:i + 1]
+                        break
+            parts.append(chunk)
+    finally:
+        chunks.close()
+    return "".join(parts)
+
+def fetch_claude_result(payload: bytes, is_action: bool) -> Dict[str, Any]:
+    """Send one Claude request and turn the streamed text into a result dict"""
+    # Action JSON is handed on as soon as its closing brace arrives, not at message_stop
+    chunks = stream_claude_text(payload)
+    raw_text = collect_action_text(chunks) if is_action else "".join(chunks)
+    
+    if raw_text:
+        if is_action:
+            # For regular commands, parse and validate the action JSON
+            return parse_action_json(raw_text)
+        else:
+            # For message enhancement or subject generation, return the raw text directly
+            return {"enhanced_message": raw_text.strip()}
+    else:
+        return {"error": "Claude response missing content."}
+
+# Identical concurrent Claude requests (e.g. a double-tapped Send) share one upstream call
+claude_inflight: Dict[bytes, concurrent.futures.Future] = {}
+claude_inflight_lock = threading.Lock()
+
+def coalesce_claude_call(key: bytes, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run fetch once per key; callers arriving while it is in flight wait for its result"""
+    with claude_inflight_lock:
+        future = claude_inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = concurrent.futures.Future()
+            claude_inflight[key] = future
+
+    if not is_owner:
+        # Waiters get their own copy so nobody mutates a shared result
+        return copy.deepcopy(future.result())
+
+    try:
+        result = fetch()
+        future.set_result(copy.deepcopy(result))
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with claude_inflight_lock:
+            claude_inflight.pop(key, None)
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+
+    __slots__ = ("maxsize", "ttl", "_data", "_lock")
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        # Copies keep callers from mutating the cached value
+        return copy.deepcopy(value)
+
+    def set(self, key: Any, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+# Repeated commands skip Anthropic entirely; the date is part of the key so
+# relative phrases like "tomorrow" are re-interpreted each day
+claude_cache = TTLCache(CONFIG["claude_cache_size"], CONFIG["claude_cache_ttl"])
+
+# Action request bodies only differ in the user text, so everything around it (including
+# the large instruction block) is serialized once and the JSON-encoded text is spliced in
+ACTION_BODY_PREFIX, ACTION_BODY_SUFFIX = json_dumps({
+    "model": CONFIG["claude_model"],
+    "max_tokens": 256,
+    "temperature": 0.0,
+    "stream": True,
+    "system": INSTRUCTION_SYSTEM,
+    "messages": [{"role": "user", "content": ""}]
+}).split(b'"content":""', 1)
+ACTION_BODY_PREFIX += b'"content":'
+
 def call_claude(prompt, use_enhancement_prompt=False, use_subject_prompt=False, original_message="", message_content=""):
     """Call Claude API with different prompts based on use case"""
     try:
-        headers = {
-            "x-api-key": CONFIG["claude_api_key"],
-            "anthropic-version": "2023-06-01",
-            "content-type": "application/json"
-        }
-        
-        if use_enhancement_prompt:
-            full_prompt = MESSAGE_ENHANCEMENT_PROMPT.format(original_message=original_message)
-        elif use_subject_prompt:
-            full_prompt = EMAIL_SUBJECT_PROMPT.format(message_content=message_content)
+        is_action = not (use_enhancement_prompt or use_subject_prompt)
+
+        # Output length dominates latency, so each call type gets a tight token budget;
+        # action JSON is short and should be deterministic
+        if is_action:
+            # Voice transcripts vary in spacing; collapsing it lets repeats share a cache entry
+            full_prompt = " ".join(prompt.split())
+            payload = ACTION_BODY_PREFIX + json_dumps(full_prompt) + ACTION_BODY_SUFFIX
         else:
-            full_prompt = f"{INSTRUCTION_PROMPT}\n\nUser: {prompt}"
+            if use_enhancement_prompt:
+                full_prompt = MESSAGE_ENHANCEMENT_PROMPT.format(original_message=original_message)
+                # The rewrite is about as long as the dictated message, so leave headroom
+                max_tokens = 1000
+            else:
+                full_prompt = EMAIL_SUBJECT_PROMPT.format(message_content=message_content)
+                max_tokens = 64
+            payload = json_dumps({
+                "model": CONFIG["claude_model"],
+                "max_tokens": max_tokens,
+                "temperature": 0.3,
+                "stream": True,
+                "messages": [{"role": "user", "content": full_prompt}]
+            })
 
-        body = {
-            "model": "claude-3-haiku-20240307",
-            "max_tokens": 1000,
-            "temperature": 0.3,
-            "messages": [{"role": "user", "content": full_prompt}]
-        }
+        key = hashlib.blake2b(payload + datetime.now().date().isoformat().encode(), digest_size=16).digest()
 
-        res = requests.post("https://api.anthropic.com/v1/messages", headers=headers, data=json.dumps(body))
-        response_json = res.json()
-        
-        if "content" in response_json:
-            raw_text = response_json["content"][0]["text"]
-            
-            if use_enhancement_prompt or use_subject_prompt:
-                # For message enhancement or subject generation, return the raw text directly
-                return {"enhanced_message": raw_text.strip()}
-            else:
-                # For regular commands, parse as JSON
-                parsed = json.loads(raw_text)
-                return parsed
-        else:
-            return {"error": "Claude response missing content."}
+        cached = claude_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = coalesce_claude_call(key, lambda: fetch_claude_result(payload, is_action))
+        if "error" not in result:
+            claude_cache.set(key, result)
+        return result
     except Exception as e:
         return {"error": str(e)}
 
+def split_action_objects(raw_text: str) -> List[Dict[str, Any]]:
+    """Parse consecutive JSON action objects (NDJSON or pretty-printed) from one response"""
+    decoder = json.JSONDecoder()
+    actions = []
+    index = raw_text.find("{")
+    while index != -1:
+        try:
+            obj, index = decoder.raw_decode(raw_text, index)
+        except ValueError:
+            break
+        if isinstance(obj, dict) and isinstance(obj.get("action"), str):
+            actions.append(obj)
+        else:
+            # Keep a placeholder so later actions stay aligned with their commands
+            actions.append({"error": f"Claude response has no action: {str(obj)[:200]}"})
+        index = raw_text.find("{", index)
+    return actions
+
+def call_claude_batch(prompts: List[str]) -> List[Dict[str, Any]]:
+    """Interpret several commands with a single Claude call, one action per command"""
+    try:
+        numbered = "\n".join(f"{i}. {prompt}" for i, prompt in enumerate(prompts, 1))
+        body = {
+            "model": CONFIG["claude_model"],
+            "max_tokens": min(256 * len(prompts), 4096),
+            "temperature": 0.0,
+            "stream": True,
+            # The cached instruction block stays first so batch calls share its prompt cache entry
+            "system": INSTRUCTION_SYSTEM + [{"type": "text", "text": BATCH_INSTRUCTION_PROMPT}],
+            "messages": [{"role": "user", "content": numbered}]
+        }
+        actions = split_action_objects("".join(stream_claude_text(json_dumps(body))))
+    except Exception as e:
+        return [{"error": str(e)} for _ in prompts]
+
+    missing = {"error": "Claude returned no action for this command."}
+    return [actions[i] if i < len(actions) else dict(missing) for i in range(len(prompts))]
+
 def enhance_message_with_claude(message: str) -> str:
     """Enhance a message using Claude AI"""
     try:
@@ -403,10 +826,10 @@ def enhance_message_with_claude(message: str) -> str:
         if "enhanced_message" in result:
             return result["enhanced_message"]
         else:
-            print(f"Enhancement failed: {result}")
+            log.warning("Enhancement failed: %s", result)
             return message  # Return original if enhancement fails
     except Exception as e:
-        print(f"Error enhancing message: {e}")
+        log.error("Error enhancing message: %s", e)
         return message  # Return original if enhancement fails
 
 def generate_email_subject(message: str) -> str:
@@ -419,32 +842,63 @@ def generate_email_subject(message: str) -> str:
             # Fallback to simple subject
             return "Message from Smart AI Agent"
     except Exception as e:
-        print(f"Error generating subject: {e}")
+        log.error("Error generating subject: %s", e)
         return "Message from Smart AI Agent"
 
+# str.translate tables so phone cleanup is one C-level pass instead of chained
+# replace() calls or a per-character generator
+PHONE_FORMATTING_TABLE = str.maketrans("", "", " -()")
+PHONE_NON_DIGIT_ASCII_TABLE = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not chr(c).isdigit() and chr(c) != "+"
+))
+
+# Recipients repeat heavily within a session and these helpers are pure functions of
+# the string, so results are memoized
+@functools.lru_cache(maxsize=1024)
+def parse_phone_number(phone: str) -> Optional["phonenumbers.PhoneNumber"]:
+    """Parse a phone number once with phonenumbers, or None if unavailable or unparseable"""
+    if not PHONENUMBERS_AVAILABLE:
+        return None
+    try:
+        return phonenumbers.parse(phone, CONFIG["default_phone_region"])
+    except phonenumbers.NumberParseException:
+        return None
+
+@functools.lru_cache(maxsize=1024)
 def is_phone_number(recipient: str) -> bool:
     """Check if recipient looks like a phone number"""
     # Remove spaces and common formatting
-    clean = recipient.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    clean = recipient.translate(PHONE_FORMATTING_TABLE)
     
     # Check if it starts with + or is all digits
-    if clean.startswith("+") and clean[1:].isdigit():
-        return True
-    if clean.isdigit() and len(clean) >= 10:
-        return True
+    if not ((clean.startswith("+") and clean[1:].isdigit()) or (clean.isdigit() and len(clean) >= 10)):
+        return False
     
-    return False
+    # With phonenumbers, also reject digit strings no region's numbering plan allows
+    if PHONENUMBERS_AVAILABLE:
+        parsed = parse_phone_number(recipient)
+        return parsed is not None and phonenumbers.is_possible_number(parsed)
+    return True
+
+# Simple email validation
+EMAIL_ADDRESS_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 def is_email_address(recipient: str) -> bool:
     """Check if recipient looks like an email address"""
-    # Simple email validation
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, recipient.strip()))
+    return bool(EMAIL_ADDRESS_PATTERN.match(recipient.strip()))
 
+@functools.lru_cache(maxsize=1024)
 def format_phone_number(phone: str) -> str:
     """Format phone number to E.164 format"""
+    parsed = parse_phone_number(phone)
+    if parsed is not None and phonenumbers.is_possible_number(parsed):
+        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    
     # Remove all non-digit characters except +
-    clean = ''.join(c for c in phone if c.isdigit() or c == '+')
+    clean = phone.translate(PHONE_NON_DIGIT_ASCII_TABLE)
+    if not clean.isascii():
+        # Rare non-ASCII input still gets the full Unicode-aware filter
+        clean = ''.join(c for c in clean if c.isdigit() or c == '+')
     
     # If it doesn't start with +, assume US number
     if not clean.startswith('+'):
@@ -455,6 +909,13 @@ def format_phone_number(phone: str) -> str:
     
     return clean
 
+# Conjunctions between recipients ("and", "&", ", and") that are treated as commas
+RECIPIENT_CONJUNCTION_PATTERNS = [
+    re.compile(r'\s+and\s+'),
+    re.compile(r'\s+&\s+'),
+    re.compile(r'\s*,\s*and\s+'),
+]
+
 def parse_recipients(recipients_text: str) -> List[str]:
     """Parse multiple recipients from text"""
     
@@ -463,9 +924,8 @@ def parse_recipients(recipients_text: str) -> List[str]:
     
     # Handle different separators and conjunctions
     # Replace common conjunctions with commas
-    recipients_text = re.sub(r'\s+and\s+', ', ', recipients_text)
-    recipients_text = re.sub(r'\s+&\s+', ', ', recipients_text)
-    recipients_text = re.sub(r'\s*,\s*and\s+', ', ', recipients_text)
+    for pattern in RECIPIENT_CONJUNCTION_PATTERNS:
+        recipients_text = pattern.sub(', ', recipients_text)
     
     # Split by comma and clean up
     recipients = [r.strip() for r in recipients_text.split(',')]
@@ -481,21 +941,36 @@ def clean_voice_message(message: str) -> str:
     message = message.replace(" question mark", "?").replace(" exclamation mark", "!")
     return message.strip()
 
+# Fully specified "task: ..." / "log: ..." commands map straight to an action, no Claude call
+SHORTCUT_COMMAND_PATTERN = re.compile(r"^\s*(task|todo|log|note)\s*:\s*(\S.*)$", re.IGNORECASE | re.DOTALL)
+
+def extract_shortcut_command(text: str) -> Optional[Dict[str, Any]]:
+    """Parse 'task: <title>' and 'log: <notes>' shortcut commands"""
+    match = SHORTCUT_COMMAND_PATTERN.match(text)
+    if not match:
+        return None
+    
+    keyword, rest = match.group(1).lower(), match.group(2).strip()
+    if keyword in ("task", "todo"):
+        return {"action": "create_task", "title": rest, "due_date": None}
+    return {"action": "log_conversation", "notes": rest}
+
+# Common patterns for email commands, compiled once at import
+EMAIL_COMMAND_PATTERNS = [
+    re.compile(r'send (?:an )?email to (.+?) (?:with subject (.+?) )?saying (.+)', re.IGNORECASE),
+    re.compile(r'email (.+?) (?:with subject (.+?) )?saying (.+)', re.IGNORECASE),
+    re.compile(r'send (.+?) (?:an )?email (?:with subject (.+?) )?saying (.+)', re.IGNORECASE),
+    re.compile(r'email (.+?) that (.+)', re.IGNORECASE),
+    re.compile(r'send (?:an )?email to (.+?) (.+)', re.IGNORECASE),  # Simple pattern: "email john@example.com hello there"
+]
+
 def extract_email_command(text: str) -> Dict[str, Any]:
     """Extract email command from voice input"""
-    # Common patterns for email commands
-    patterns = [
-        r'send (?:an )?email to (.+?) (?:with subject (.+?) )?saying (.+)',
-        r'email (.+?) (?:with subject (.+?) )?saying (.+)',
-        r'send (.+?) (?:an )?email (?:with subject (.+?) )?saying (.+)',
-        r'email (.+?) that (.+)',
-        r'send (?:an )?email to (.+?) (.+)',  # Simple pattern: "email john@example.com hello there"
-    ]
     
     text_lower = text.lower().strip()
     
-    for pattern in patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
+    for pattern in EMAIL_COMMAND_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             groups = match.groups()
             
@@ -527,22 +1002,23 @@ def extract_email_command(text: str) -> Dict[str, Any]:
     
     return None
 
+# Common patterns for SMS commands, compiled once at import
+SMS_COMMAND_PATTERNS = [
+    re.compile(r'send (?:a )?(?:text|message|sms) to (.+?) saying (.+)', re.IGNORECASE),
+    re.compile(r'text (.+?) saying (.+)', re.IGNORECASE),
+    re.compile(r'message (.+?) saying (.+)', re.IGNORECASE),
+    re.compile(r'send (.+?) the message (.+)', re.IGNORECASE),
+    re.compile(r'tell (.+?) that (.+)', re.IGNORECASE),
+    re.compile(r'text (.+?) (.+)', re.IGNORECASE),  # Simple pattern: "text John hello there"
+]
+
 def extract_sms_command(text: str) -> Dict[str, str]:
     """Extract SMS command from voice input using pattern matching (ORIGINAL WORKING VERSION)"""
-    # Common patterns for SMS commands
-    patterns = [
-        r'send (?:a )?(?:text|message|sms) to (.+?) saying (.+)',
-        r'text (.+?) saying (.+)',
-        r'message (.+?) saying (.+)',
-        r'send (.+?) the message (.+)',
-        r'tell (.+?) that (.+)',
-        r'text (.+?) (.+)',  # Simple pattern: "text John hello there"
-    ]
     
     text_lower = text.lower().strip()
     
-    for pattern in patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
+    for pattern in SMS_COMMAND_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             recipient = match.group(1).strip()
             message = match.group(2).strip()
@@ -559,25 +1035,25 @@ def extract_sms_command(text: str) -> Dict[str, str]:
     
     return None
 
+# Patterns for SMS commands with multiple recipients
+SMS_MULTI_COMMAND_PATTERNS = [
+    # "send a text to John and Mary saying hello"
+    re.compile(r'send (?:a )?(?:text|message|sms) to (.+?) saying (.+)', re.IGNORECASE),
+    # "text John, Mary, and Bob saying hello"
+    re.compile(r'text (.+?) saying (.+)', re.IGNORECASE),
+    # "message John and Mary that we're running late"
+    re.compile(r'message (.+?) (?:that|saying) (.+)', re.IGNORECASE),
+    # "tell John, Mary, and Bob that the meeting moved"
+    re.compile(r'tell (.+?) that (.+)', re.IGNORECASE),
+]
+
 def extract_sms_command_multi(text: str) -> Dict[str, Any]:
     """Enhanced SMS command extraction supporting multiple recipients"""
     
-    # Patterns for multiple recipients
-    multi_patterns = [
-        # "send a text to John and Mary saying hello"
-        r'send (?:a )?(?:text|message|sms) to (.+?) saying (.+)',
-        # "text John, Mary, and Bob saying hello"
-        r'text (.+?) saying (.+)',
-        # "message John and Mary that we're running late"
-        r'message (.+?) (?:that|saying) (.+)',
-        # "tell John, Mary, and Bob that the meeting moved"
-        r'tell (.+?) that (.+)',
-    ]
-    
     text_lower = text.lower().strip()
     
-    for pattern in multi_patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
+    for pattern in SMS_MULTI_COMMAND_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             recipients_text = match.group(1).strip()
             message = match.group(2).strip()
@@ -607,23 +1083,23 @@ def extract_sms_command_multi(text: str) -> Dict[str, Any]:
     
     return None
 
+# Patterns for email commands with multiple recipients
+EMAIL_MULTI_COMMAND_PATTERNS = [
+    # "send an email to john@example.com and mary@example.com saying hello"
+    re.compile(r'send (?:an )?email to (.+?) (?:with subject (.+?) )?saying (.+)', re.IGNORECASE),
+    # "email john@example.com, mary@example.com saying hello"
+    re.compile(r'email (.+?) saying (.+)', re.IGNORECASE),
+    # "send john@example.com and mary@example.com an email saying hello"
+    re.compile(r'send (.+?) (?:an )?email saying (.+)', re.IGNORECASE),
+]
+
 def extract_email_command_multi(text: str) -> Dict[str, Any]:
     """Enhanced email command extraction supporting multiple recipients"""
     
-    # Patterns for multiple email recipients
-    multi_patterns = [
-        # "send an email to john@example.com and mary@example.com saying hello"
-        r'send (?:an )?email to (.+?) (?:with subject (.+?) )?saying (.+)',
-        # "email john@example.com, mary@example.com saying hello"
-        r'email (.+?) saying (.+)',
-        # "send john@example.com and mary@example.com an email saying hello"
-        r'send (.+?) (?:an )?email saying (.+)',
-    ]
-    
     text_lower = text.lower().strip()
     
-    for pattern in multi_patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
+    for pattern in EMAIL_MULTI_COMMAND_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             groups = match.groups()
             
@@ -665,6 +1141,12 @@ def extract_email_command_multi(text: str) -> Dict[str, Any]:
     
     return None
 
+# Patterns that might contain both phones and emails (mixed messaging)
+MIXED_MESSAGE_PATTERNS = [
+    re.compile(r'(?:send|message) (.+?) (?:saying|that) (.+)', re.IGNORECASE),
+    re.compile(r'(?:tell|notify) (.+?) (?:that|about) (.+)', re.IGNORECASE),
+]
+
 def send_single_sms(recipient: str, message: str) -> Dict[str, Any]:
     """Send SMS to a single recipient"""
     
@@ -883,11 +1365,11 @@ def send_mixed_messages(recipients: List[str], message: str, subject: str = None
 # ----- CMP Action Handlers -----
 
 def handle_create_task(data):
-    print("[CMP] Creating task:", data.get("title"), data.get("due_date"))
+    log.info("[CMP] Creating task: %s %s", data.get("title"), data.get("due_date"))
     return f"Task '{data.get('title')}' scheduled for {data.get('due_date')}."
 
 def handle_create_appointment(data):
-    print("[CMP] Creating appointment:", data.get("title"), data.get("due_date"))
+    log.info("[CMP] Creating appointment: %s %s", data.get("title"), data.get("due_date"))
     return f"Appointment '{data.get('title')}' booked for {data.get('due_date')}."
 
 def handle_send_message(data):
@@ -895,18 +1377,18 @@ def handle_send_message(data):
     message = data.get("message", "")
     original_message = data.get("original_message", message)
     
-    print(f"[CMP] Sending message to {recipient}")
+    log.info("[CMP] Sending message to %s", recipient)
     
     # Check if recipient is a phone number
     if is_phone_number(recipient):
         # Format phone number
         formatted_phone = format_phone_number(recipient)
-        print(f"[CMP] Detected phone number, processing SMS to {formatted_phone}")
+        log.info("[CMP] Detected phone number, processing SMS to %s", formatted_phone)
         
         # Enhance the message using Claude AI
-        print(f"[CMP] Original message: {original_message}")
+        log.info("[CMP] Original message: %s", original_message)
         enhanced_message = enhance_message_with_claude(original_message)
-        print(f"[CMP] Enhanced message: {enhanced_message}")
+        log.info("[CMP] Enhanced message: %s", enhanced_message)
         
         # Send the enhanced message
         result = twilio_client.send_sms(formatted_phone, enhanced_message)
@@ -927,21 +1409,21 @@ def handle_send_email(data):
     subject = data.get("subject", "")
     original_message = data.get("original_message", message)
     
-    print(f"[CMP] Sending email to {recipient}")
+    log.info("[CMP] Sending email to %s", recipient)
     
     # Check if recipient is an email address
     if is_email_address(recipient):
-        print(f"[CMP] Detected email address, processing email to {recipient}")
+        log.info("[CMP] Detected email address, processing email to %s", recipient)
         
         # Enhance the message using Claude AI
-        print(f"[CMP] Original message: {original_message}")
+        log.info("[CMP] Original message: %s", original_message)
         enhanced_message = enhance_message_with_claude(original_message)
-        print(f"[CMP] Enhanced message: {enhanced_message}")
+        log.info("[CMP] Enhanced message: %s", enhanced_message)
         
         # Generate subject if not provided
         if not subject:
             subject = generate_email_subject(enhanced_message)
-            print(f"[CMP] Generated subject: {subject}")
+            log.info("[CMP] Generated subject: %s", subject)
         
         # Send the enhanced email
         result = email_client.send_email(recipient, subject, enhanced_message)
@@ -968,7 +1450,7 @@ def handle_send_message_multi(data: Dict[str, Any]) -> str:
     if not message:
         return "❌ No message specified"
     
-    print(f"[CMP] Sending message to {len(recipients)} recipients: {recipients}")
+    log.info("[CMP] Sending message to %d recipients: %s", len(recipients), recipients)
     
     # Send to multiple recipients
     result = send_sms_to_multiple(recipients, original_message, enhance=True)
@@ -1008,7 +1490,7 @@ def handle_send_email_multi(data: Dict[str, Any]) -> str:
     if not message:
         return "❌ No message specified"
     
-    print(f"[CMP] Sending email to {len(recipients)} recipients: {recipients}")
+    log.info("[CMP] Sending email to %d recipients: %s", len(recipients), recipients)
     
     # Send emails to multiple recipients
     result = send_emails_to_multiple(recipients, subject, original_message, enhance=True)
@@ -1036,660 +1518,165 @@ def handle_send_email_multi(data: Dict[str, Any]) -> str:
         return f"❌ Failed to send emails to all {result['total_recipients']} recipients"
 
 def handle_log_conversation(data):
-    print("[CMP] Logging conversation:", data.get("notes"))
+    log.info("[CMP] Logging conversation: %s", data.get("notes"))
     return "Conversation log saved."
 
+def handle_unknown_action(data):
+    return f"Unknown action: {data.get('action')}"
+
+# Action name -> handler; read-only so the table can't be mutated at runtime
+ACTION_HANDLERS: Mapping[str, Callable[[Dict[str, Any]], str]] = MappingProxyType({
+    "create_task": handle_create_task,
+    "create_appointment": handle_create_appointment,
+    "send_message": handle_send_message,
+    "send_message_multi": handle_send_message_multi,
+    "send_email": handle_send_email,
+    "send_email_multi": handle_send_email_multi,
+    "log_conversation": handle_log_conversation,
+})
+
 def dispatch_action(parsed):
     """Enhanced dispatch function with email and multi-recipient support"""
-    action = parsed.get("action")
-    if action == "create_task":
-        return handle_create_task(parsed)
-    elif action == "create_appointment":
-        return handle_create_appointment(parsed)
-    elif action == "send_message":
-        return handle_send_message(parsed)
-    elif action == "send_message_multi":
-        return handle_send_message_multi(parsed)
-    elif action == "send_email":
-        return handle_send_email(parsed)
-    elif action == "send_email_multi":
-        return handle_send_email_multi(parsed)
-    elif action == "log_conversation":
-        return handle_log_conversation(parsed)
+    return ACTION_HANDLERS.get(parsed.get("action"), handle_unknown_action)(parsed)
+
+# ----- Static Responses -----
+# The HTML shell and service worker live in static/ so a front proxy can serve them
+# without touching Python. When Flask does serve them, they and the manifest are
+# serialized and compressed once at import and served with an ETag for 304 revalidation.
+# None of these URLs are versioned, so nothing is marked immutable: the manifest and icon
+# rarely change and can be cached for a day, while the service worker must always revalidate
+# (a cheap 304 via its ETag) or clients would keep running a stale worker.
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+MANIFEST_CACHE_CONTROL = "public, max-age=86400"
+SW_CACHE_CONTROL = "no-cache"
+
+def read_static_file(filename: str) -> str:
+    """Read a file from the static folder (also served directly by nginx in production)"""
+    with open(os.path.join(app.static_folder, filename), encoding="utf-8") as f:
+        return f.read()
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag value derived from the response body"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+class StaticAsset:
+    """Precomputed response body plus gzip/brotli variants, each with its own ETag"""
+
+    __slots__ = ("mimetype", "cache_control", "variants", "encodings")
+
+    def __init__(self, body: bytes, mimetype: str, cache_control: str = STATIC_CACHE_CONTROL):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.variants = {"identity": (body, make_etag(body))}
+
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            compressed["br"] = brotli.compress(body, quality=11)
+        for encoding, data in compressed.items():
+            if len(data) < len(body):
+                self.variants[encoding] = (data, make_etag(data))
+
+        # Preferred order when the client accepts several encodings equally
+        self.encodings = [e for e in ("br", "gzip") if e in self.variants]
+
+def static_response(asset: StaticAsset) -> Response:
+    """Serve the best precompressed variant, answering matching conditional GETs with 304"""
+    encoding = request.accept_encodings.best_match(asset.encodings, default="identity")
+    body, etag = asset.variants[encoding]
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
     else:
-        return f"Unknown action: {action}"
+        response = Response(body, mimetype=asset.mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = asset.cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+# ----- App Icon -----
+# Served once by URL for both the manifest and the page instead of as a base64 data URI
+# inlined into each of them
+ICON_ASSET = StaticAsset(read_static_file("icon.svg").encode("utf-8"), "image/svg+xml", MANIFEST_CACHE_CONTROL)
+
+@app.route('/icon.svg')
+def icon():
+    return static_response(ICON_ASSET)
 
 # ----- PWA Manifest -----
+MANIFEST = {
+    "name": "Smart AI Agent",
+    "short_name": "AI Agent",
+    "description": "AI-powered task and appointment manager with professional voice SMS & Email",
+    "start_url": "/",
+    "display": "standalone",
+    "background_color": "#f8f9fa",
+    "theme_color": "#007bff",
+    "icons": [
+        {
+            "src": "/icon.svg",
+            "sizes": "192x192",
+            "type": "image/svg+xml",
+            "purpose": "any maskable"
+        }
+    ],
+    "categories": ["productivity", "utilities"],
+    "orientation": "portrait"
+}
+
+MANIFEST_ASSET = StaticAsset(json_dumps(MANIFEST), "application/manifest+json", MANIFEST_CACHE_CONTROL)
+
 @app.route('/manifest.json')
 def manifest():
-    return jsonify({
-        "name": "Smart AI Agent",
-        "short_name": "AI Agent",
-        "description": "AI-powered task and appointment manager with professional voice SMS & Email",
-        "start_url": "/",
-        "display": "standalone",
-        "background_color": "#f8f9fa",
-        "theme_color": "#007bff",
-        "icons": [
-            {
-                "src": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTkyIiBoZWlnaHQ9IjE5MiIgdmlld0JveD0iMCAwIDE5MiAxOTIiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxyZWN0IHdpZHRoPSIxOTIiIGhlaWdodD0iMTkyIiByeD0iMjQiIGZpbGw9IiMwMDdiZmYiLz4KPHN2ZyB4PSI0OCIgeT0iNDgiIHdpZHRoPSI5NiIgaGVpZ2h0PSI5NiIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9IndoaXRlIiBzdHJva2Utd2lkdGg9IjIiIHN0cm9rZS1saW5lY2FwPSJyb3VuZCIgc3Ryb2tlLWxpbmVqb2luPSJyb3VuZCI+CjxwYXRoIGQ9Im0xMiAzLTEuOTEyIDUuODEzYTIgMiAwIDAgMS0xLjI5NSAxLjI5NUwzIDEyIDguODEzIDEzLjkxMmEyIDIgMCAwIDEgMS4yOTUgMS4yOTVMMTIgMjEgMTMuOTEyIDE1LjE4N2EyIDIgMCAwIDEgMS4yOTUtMS4yOTVMMjEgMTIgMTUuMTg3IDEwLjA4OGEyIDIgMCAwIDEtMS4yOTUtMS4yOTVMMTIgMyIvPgo8L3N2Zz4KPC9zdmc+",
-                "sizes": "192x192",
-                "type": "image/svg+xml",
-                "purpose": "any maskable"
-            }
-        ],
-        "categories": ["productivity", "utilities"],
-        "orientation": "portrait"
-    })
+    return static_response(MANIFEST_ASSET)
 
 # ----- Service Worker -----
+SW_JS = read_static_file("sw.js")
+
+SW_ASSET = StaticAsset(SW_JS.encode("utf-8"), "application/javascript", SW_CACHE_CONTROL)
+
 @app.route('/sw.js')
 def service_worker():
-    return '''
-const CACHE_NAME = 'ai-agent-v1';
-const urlsToCache = [
-  '/',
-  '/manifest.json'
-];
-
-self.addEventListener('install', event => {
-  event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => cache.addAll(urlsToCache))
-  );
-});
-
-self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request)
-      .then(response => {
-        if (response) {
-          return response;
-        }
-        return fetch(event.request);
-      })
-  );
-});
-''', {'Content-Type': 'application/javascript'}
+    return static_response(SW_ASSET)
 
 # ----- Enhanced Mobile HTML Template -----
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0, user-scalable=no">
- <link rel="icon" type="image/png" href="https://assets.cdn.filesafe.space/3lSeAHXNU9t09Hhp9oai/media/687bba55e31a7722ec2593a8.png">
-<link rel="apple-touch-icon" href="https://assets.cdn.filesafe.space/3lSeAHXNU9t09Hhp9oai/media/687bc4d4e36c15754e18b561.png">
-  <title>Smart AI Agent</title>
-  <link rel="manifest" href="/manifest.json">
-  <meta name="theme-color" content="#007bff">
-  <meta name="apple-mobile-web-app-capable" content="yes">
-  <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-  <meta name="apple-mobile-web-app-title" content="AI Agent">
-  <link rel="apple-touch-icon" href="data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTkyIiBoZWlnaHQ9IjE5MiIgdmlld0JveD0iMCAwIDE5MiAxOTIiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxyZWN0IHdpZHRoPSIxOTIiIGhlaWdodD0iMTkyIiByeD0iMjQiIGZpbGw9IiMwMDdiZmYiLz4KPHN2ZyB4PSI0OCIgeT0iNDgiIHdpZHRoPSI5NiIgaGVpZ2h0PSI5NiIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9IndoaXRlIiBzdHJva2Utd2lkdGg9IjIiIHN0cm9rZS1saW5lY2FwPSJyb3VuZCIgc3Ryb2tlLWxpbmVqb2luPSJyb3VuZCI+CjxwYXRoIGQ9Im0xMiAzLTEuOTEyIDUuODEzYTIgMiAwIDAgMS0xLjI5NSAxLjI5NUwzIDEyIDguODEzIDEzLjkxMmEyIDIgMCAwIDEgMS4yOTUgMS4yOTVMMTIgMjEgMTMuOTEyIDE1LjE4N2EyIDIgMCAwIDEgMS4yOTUtMS4yOTVMMjEgMTIgMTUuMTg3IDEwLjA4OGEyIDIgMCAwIDEtMS4yOTUtMS4yOTVMMTIgMyIvPgo8L3N2Zz4KPC9zdmc+">
-  <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-  <style>
-    * {
-      box-sizing: border-box;
-      -webkit-tap-highlight-color: transparent;
-    }
-    
-    body {
-      font-family: 'Inter', -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-      background: linear-gradient(to bottom, #2f2f2f 0%, #f9fafb 100%);
-      margin: 0;
-      padding: 1rem;
-      min-height: 100vh;
-      display: flex;
-      flex-direction: column;
-      align-items: center;
-      justify-content: flex-start;
-      color: #212529;
-      padding-top: env(safe-area-inset-top);
-      padding-bottom: env(safe-area-inset-bottom);
-    }
-
-    .container {
-      width: 100%;
-      max-width: 600px;
-      display: flex;
-      flex-direction: column;
-      gap: 1.5rem;
-      margin-top: 2rem;
-    }
-
-    h1 {
-      font-size: 2.2rem;
-      margin: 0;
-      text-align: center;
-      font-weight: 700;
-      color: white;
-      letter-spacing: -0.025em;
-      text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-
-    .subtitle {
-      font-size: 1rem;
-      color: rgba(255,255,255,0.9);
-      text-align: center;
-      margin-bottom: 2rem;
-      font-weight: 400;
-      line-height: 1.5;
-    }
-
-    .feature-badge {
-      background: rgba(255,255,255,0.2);
-      color: white;
-      padding: 0.5rem 1rem;
-      border-radius: 20px;
-      font-size: 0.85rem;
-      font-weight: 500;
-      display: inline-block;
-      margin: 0 auto 1rem;
-      backdrop-filter: blur(10px);
-      border: 1px solid rgba(255,255,255,0.3);
-    }
-
-    .input-container {
-      background: rgba(255,255,255,0.95);
-      border-radius: 16px;
-      padding: 1.5rem;
-      border: 1px solid rgba(255,255,255,0.2);
-      box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-      backdrop-filter: blur(10px);
-    }
-
-    .input-group {
-      display: flex;
-      gap: 0.75rem;
-      align-items: center;
-    }
-
-    input {
-      flex: 1;
-      padding: 16px 20px;
-      font-size: 16px;
-      border: 2px solid #e9ecef;
-      border-radius: 12px;
-      background: white;
-      outline: none;
-      color: #212529;
-      font-family: 'Inter', sans-serif;
-      transition: all 0.3s ease;
-    }
-
-    input:focus {
-      border-color: #007bff;
-      box-shadow: 0 0 0 3px rgba(0, 123, 255, 0.1);
-      transform: translateY(-1px);
-    }
-
-    input::placeholder {
-      color: #6c757d;
-      font-weight: 400;
-    }
-
-    button {
-      padding: 16px 28px;
-      font-size: 16px;
-      font-weight: 600;
-      border: none;
-      border-radius: 12px;
-      background: linear-gradient(45deg, #007bff, #0056b3);
-      color: white;
-      cursor: pointer;
-      min-width: 90px;
-      transition: all 0.3s ease;
-      font-family: 'Inter', sans-serif;
-      box-shadow: 0 4px 12px rgba(0, 123, 255, 0.3);
-    }
-
-    button:hover {
-      transform: translateY(-2px);
-      box-shadow: 0 6px 20px rgba(0, 123, 255, 0.4);
-    }
-
-    button:active {
-      transform: translateY(0);
-    }
-
-    .response-container {
-      background: rgba(255,255,255,0.95);
-      border-radius: 16px;
-      padding: 1.5rem;
-      border: 1px solid rgba(255,255,255,0.2);
-      min-height: 300px;
-      flex: 1;
-      box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-      backdrop-filter: blur(10px);
-    }
-
-    .response-text {
-      font-size: 14px;
-      line-height: 1.6;
-      white-space: pre-wrap;
-      word-wrap: break-word;
-      color: #495057;
-      font-family: 'Inter', sans-serif;
-      font-weight: 400;
-    }
+HTML_TEMPLATE = read_static_file("index.html")
 
-    .voice-controls {
-      display: flex;
-      justify-content: center;
-      align-items: center;
-      gap: 1rem;
-      margin-top: 1rem;
-    }
-
-    .mic-button {
-      width: 72px;
-      height: 72px;
-      border-radius: 50%;
-      background: linear-gradient(45deg, #dc3545, #c82333);
-      border: none;
-      color: white;
-      font-size: 28px;
-      cursor: pointer;
-      transition: all 0.3s ease;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      position: relative;
-      overflow: hidden;
-      box-shadow: 0 6px 20px rgba(220, 53, 69, 0.4);
-    }
-
-    .mic-button:hover {
-      transform: scale(1.05);
-      box-shadow: 0 8px 24px rgba(220, 53, 69, 0.5);
-    }
-
-    .mic-button.recording {
-      background: linear-gradient(45deg, #28a745, #20c997);
-      animation: pulse 1.5s infinite;
-      box-shadow: 0 6px 20px rgba(40, 167, 69, 0.5);
-    }
-
-    .mic-button.recording::before {
-      content: '';
-      position: absolute;
-      top: 50%;
-      left: 50%;
-      width: 100%;
-      height: 100%;
-      background: rgba(255,255,255,0.3);
-      border-radius: 50%;
-      transform: translate(-50%, -50%) scale(0);
-      animation: ripple 1.5s infinite;
-    }
-
-    @keyframes pulse {
-      0% { transform: scale(1); }
-      50% { transform: scale(1.05); }
-      100% { transform: scale(1); }
-    }
-
-    @keyframes ripple {
-      0% { transform: translate(-50%, -50%) scale(0); opacity: 1; }
-      100% { transform: translate(-50%, -50%) scale(2); opacity: 0; }
-    }
-
-    .voice-status {
-      font-size: 0.9rem;
-      color: #212529;
-      text-align: center;
-      margin-top: 0.75rem;
-      min-height: 22px;
-      font-weight: 500;
-      text-shadow: none;
-    }
-
-    .voice-not-supported {
-      color: #ffc107;
-      font-size: 0.85rem;
-      text-align: center;
-      margin-top: 0.5rem;
-      font-weight: 500;
-    }
-
-    .install-prompt {
-      position: fixed;
-      bottom: 20px;
-      left: 20px;
-      right: 20px;
-      background: #007bff;
-      color: white;
-      padding: 16px 20px;
-      border-radius: 12px;
-      display: none;
-      align-items: center;
-      justify-content: space-between;
-      z-index: 1000;
-      box-shadow: 0 8px 24px rgba(0, 123, 255, 0.3);
-      font-weight: 500;
-    }
-
-    .install-prompt button {
-      background: rgba(255,255,255,0.2);
-      border: none;
-      color: white;
-      padding: 10px 16px;
-      border-radius: 8px;
-      font-size: 14px;
-      cursor: pointer;
-      font-weight: 500;
-      transition: all 0.2s ease;
-    }
-
-    .install-prompt button:hover {
-      background: rgba(255,255,255,0.3);
-    }
-
-    @media (max-width: 480px) {
-      .container {
-        max-width: 100%;
-        margin-top: 1rem;
-        gap: 1rem;
-      }
-      
-      body {
-        padding: 0.75rem;
-      }
-      
-      h1 {
-        font-size: 1.8rem;
-      }
-      
-      .subtitle {
-        font-size: 0.9rem;
-        margin-bottom: 1.5rem;
-      }
-      
-      .mic-button {
-        width: 64px;
-        height: 64px;
-        font-size: 24px;
-      }
-      
-      .input-container, .response-container {
-        padding: 1.25rem;
-      }
-    }
-  </style>
-</head>
-<body>
-  <div class="container">
-    <h1>Smart AI Agent</h1>
-    <div class="subtitle">Speak naturally - AI handles SMS & Email professionally</div>
-    <div class="feature-badge">✨ Multi-Recipient Auto-Enhanced Messages & Emails</div>
-    
-    <div class="input-container">
-      <div class="input-group">
-        <input type="text" id="command" placeholder="Try: 'Text John saying hello' or 'Email john@example.com saying meeting at 3pm'" />
-        <button onclick="sendCommand()">Send</button>
-      </div>
-    </div>
-
-    <div class="response-container">
-      <div class="response-text" id="response">🎯 Ready to send professional messages and emails! 
-
-📱 SMS Examples:
-• "Text 8136414177 saying hey how are you"
-• "Text John and Mary saying the meeting moved to 3pm"
-
-📧 Email Examples:
-• "Email john@example.com saying the meeting is at 3pm"
-• "Email john@example.com with subject meeting update saying the time changed"
-• "Email john@example.com and mary@example.com saying hello everyone"
-
-🔄 Mixed Examples:
-• "Send a message to 8136414177 and john@example.com saying hello"
-• "Message Mom and dad@example.com that I'll be home late"
-
-Use the microphone button below or type your command.</div>
-    </div>
-
-    <div class="voice-controls">
-      <button class="mic-button" id="micButton" onclick="toggleVoiceRecording()">
-        🎤
-      </button>
-    </div>
-    <div class="voice-status" id="voiceStatus"></div>
-  </div>
-
-  <div class="install-prompt" id="installPrompt">
-    <span>Install this app for the full experience!</span>
-    <button onclick="installApp()">Install</button>
-    <button onclick="hideInstallPrompt()">×</button>
-  </div>
-
-  <script>
-    let deferredPrompt;
-    let recognition;
-    let isRecording = false;
-    let voiceSupported = false;
-
-    // Initialize speech recognition (ORIGINAL MOBILE-WORKING VERSION)
-    function initSpeechRecognition() {
-      if ('webkitSpeechRecognition' in window || 'SpeechRecognition' in window) {
-        const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
-        recognition = new SpeechRecognition();
-        
-        recognition.continuous = false;
-        recognition.interimResults = true;
-        recognition.lang = 'en-US';
-        recognition.maxAlternatives = 3;
-        
-        recognition.onstart = function() {
-          isRecording = true;
-          document.getElementById('micButton').classList.add('recording');
-          document.getElementById('voiceStatus').textContent = '🎤 Listening... Speak naturally!';
-          document.getElementById('command').placeholder = 'Listening...';
-        };
-        
-        recognition.onresult = function(event) {
-          let transcript = '';
-          let isFinal = false;
-          
-          for (let i = event.resultIndex; i < event.results.length; i++) {
-            if (event.results[i].isFinal) {
-              transcript += event.results[i][0].transcript;
-              isFinal = true;
-            } else {
-              // Show interim results
-              document.getElementById('command').value = event.results[i][0].transcript;
-            }
-          }
-          
-          if (isFinal) {
-            document.getElementById('command').value = transcript.trim();
-            document.getElementById('voiceStatus').textContent = `📝 Captured: "${transcript.trim()}"`;
-            
-            // Auto-submit after voice input with a delay
-            setTimeout(() => {
-              document.getElementById('voiceStatus').textContent = 'Processing with AI...';
-              sendCommand();
-            }, 1500);
-          }
-        };
-        
-        recognition.onerror = function(event) {
-          console.error('Speech recognition error:', event.error);
-          let errorMessage = '❌ ';
-          switch(event.error) {
-            case 'no-speech':
-              errorMessage += 'No speech detected. Try speaking louder.';
-              break;
-            case 'audio-capture':
-              errorMessage += 'Microphone not accessible.';
-              break;
-            case 'not-allowed':
-              errorMessage += 'Microphone permission denied.';
-              break;
-            case 'network':
-              errorMessage += 'Network error. Check connection.';
-              break;
-            default:
-              errorMessage += `Error: ${event.error}`;
-          }
-          document.getElementById('voiceStatus').textContent = errorMessage;
-          stopRecording();
-        };
-        
-        recognition.onend = function() {
-          stopRecording();
-        };
-        
-        voiceSupported = true;
-        document.getElementById('voiceStatus').textContent = 'Tap microphone to speak your message';
-      } else {
-        document.getElementById('voiceStatus').innerHTML = '<div class="voice-not-supported">⚠️ Voice input not supported in this browser</div>';
-        document.getElementById('micButton').style.display = 'none';
-      }
-    }
-
-    function toggleVoiceRecording() {
-      if (!voiceSupported) return;
-      
-      if (isRecording) {
-        recognition.stop();
-      } else {
-        try {
-          // Clear previous input
-          document.getElementById('command').value = '';
-          recognition.start();
-        } catch (error) {
-          console.error('Failed to start speech recognition:', error);
-          document.getElementById('voiceStatus').textContent = '❌ Failed to start voice input';
-        }
-      }
-    }
-
-    function stopRecording() {
-      isRecording = false;
-      document.getElementById('micButton').classList.remove('recording');
-      document.getElementById('command').placeholder = 'Try: "Text John saying hello" or "Email john@example.com saying meeting at 3pm"';
-      
-      if (document.getElementById('voiceStatus').textContent.includes('Listening')) {
-        document.getElementById('voiceStatus').textContent = 'Tap microphone to speak your message';
-      }
-    }
-
-    // PWA Install prompt
-    window.addEventListener('beforeinstallprompt', (e) => {
-      e.preventDefault();
-      deferredPrompt = e;
-      document.getElementById('installPrompt').style.display = 'flex';
-    });
-
-    function installApp() {
-      if (deferredPrompt) {
-        deferredPrompt.prompt();
-        deferredPrompt.userChoice.then((choiceResult) => {
-          if (choiceResult.outcome === 'accepted') {
-            console.log('User accepted the install prompt');
-          }
-          deferredPrompt = null;
-          hideInstallPrompt();
-        });
-      }
-    }
-
-    function hideInstallPrompt() {
-      document.getElementById('installPrompt').style.display = 'none';
-    }
-
-    // Register service worker
-    if ('serviceWorker' in navigator) {
-      navigator.serviceWorker.register('/sw.js');
-    }
-
-    function sendCommand() {
-      const input = document.getElementById('command');
-      const output = document.getElementById('response');
-      const userText = input.value.trim();
-
-      if (!userText) {
-        output.textContent = "⚠️ Please enter a command or use voice input.";
-        return;
-      }
-
-      output.textContent = "Processing with AI and enhancing message...";
-
-      fetch("/execute", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ text: userText })
-      })
-      .then(res => res.json())
-      .then(data => {
-        output.textContent = "✅ " + (data.response || "Done!") + "\\n\\n📋 Raw Response:\\n" + JSON.stringify(data.claude_output, null, 2);
-        input.value = "";
-        document.getElementById('voiceStatus').textContent = voiceSupported ? 'Tap microphone to speak your message' : '';
-      })
-      .catch(err => {
-        output.textContent = "❌ Error: " + err.message;
-        document.getElementById('voiceStatus').textContent = voiceSupported ? 'Tap microphone to speak your message' : '';
-      });
-    }
-
-    // Allow Enter key to submit
-    document.getElementById('command').addEventListener('keypress', function(e) {
-      if (e.key === 'Enter') {
-        sendCommand();
-      }
-    });
-
-    // Handle keyboard on mobile
-    document.getElementById('command').addEventListener('focus', function() {
-      setTimeout(() => {
-        this.scrollIntoView({ behavior: 'smooth', block: 'center' });
-      }, 300);
-    });
-
-    // Initialize speech recognition when page loads
-    window.addEventListener('load', initSpeechRecognition);
-
-    // Request microphone permission on first interaction
-    document.getElementById('micButton').addEventListener('click', function() {
-      if (!voiceSupported) return;
-      
-      // Request microphone permission
-      navigator.mediaDevices.getUserMedia({ audio: true })
-        .then(function(stream) {
-          // Permission granted, stop the stream
-          stream.getTracks().forEach(track => track.stop());
-        })
-        .catch(function(err) {
-          console.log('Microphone permission denied:', err);
-          document.getElementById('voiceStatus').textContent = '❌ Microphone permission required';
-        });
-    });
-  </script>
-</body>
-</html>
-"""
+HTML_ASSET = StaticAsset(HTML_TEMPLATE.encode("utf-8"), "text/html")
 
 # ----- Routes -----
 
 @app.route("/")
 def root():
-    return HTML_TEMPLATE
+    return static_response(HTML_ASSET)
 
 # Enhanced execute route with email support
 @app.route('/execute', methods=['POST'])
 def execute():
     try:
-        data = request.json
-        prompt = data.get("text", "")
+        data = request.json or {}
+        prompt = str(data.get("text") or "").strip()
+        
+        # Empty input never reaches Claude (the API rejects empty content anyway)
+        if not prompt:
+            return jsonify({"response": "Please enter a command."}), 400
+        
+        # Shortcut commands are dispatched locally
+        shortcut_command = extract_shortcut_command(prompt)
+        
+        if shortcut_command:
+            log.info("[SHORTCUT] Detected shortcut command: %s", shortcut_command)
+            return jsonify({
+                "response": dispatch_action(shortcut_command),
+                "claude_output": shortcut_command
+            })
         
         # FIRST: Try email commands
         email_command = extract_email_command(prompt)
         
         if email_command:
-            print(f"[VOICE EMAIL] Detected email command: {email_command}")
+            log.info("[VOICE EMAIL] Detected email command: %s", email_command)
             dispatch_result = handle_send_email(email_command)
             return jsonify({
                 "response": dispatch_result,
@@ -1700,7 +1687,7 @@ def execute():
         multi_email_command = extract_email_command_multi(prompt)
         
         if multi_email_command:
-            print(f"[VOICE EMAIL MULTI] Detected multi-recipient email: {multi_email_command}")
+            log.info("[VOICE EMAIL MULTI] Detected multi-recipient email: %s", multi_email_command)
             if multi_email_command["action"] == "send_email_multi":
                 dispatch_result = handle_send_email_multi(multi_email_command)
             else:
@@ -1714,7 +1701,7 @@ def execute():
         sms_command = extract_sms_command(prompt)
         
         if sms_command:
-            print(f"[VOICE SMS] Detected SMS command: {sms_command}")
+            log.info("[VOICE SMS] Detected SMS command: %s", sms_command)
             dispatch_result = handle_send_message(sms_command)
             return jsonify({
                 "response": dispatch_result,
@@ -1725,7 +1712,7 @@ def execute():
         multi_sms_command = extract_sms_command_multi(prompt)
         
         if multi_sms_command:
-            print(f"[VOICE SMS MULTI] Detected multi-recipient SMS: {multi_sms_command}")
+            log.info("[VOICE SMS MULTI] Detected multi-recipient SMS: %s", multi_sms_command)
             if multi_sms_command["action"] == "send_message_multi":
                 dispatch_result = handle_send_message_multi(multi_sms_command)
             else:
@@ -1737,14 +1724,8 @@ def execute():
         
         # FIFTH: Check for mixed message commands (phone numbers and emails together)
         if "message" in prompt.lower() or "send" in prompt.lower():
-            # Look for patterns that might contain both phones and emails
-            mixed_patterns = [
-                r'(?:send|message) (.+?) (?:saying|that) (.+)',
-                r'(?:tell|notify) (.+?) (?:that|about) (.+)',
-            ]
-            
-            for pattern in mixed_patterns:
-                match = re.search(pattern, prompt.lower(), re.IGNORECASE)
+            for pattern in MIXED_MESSAGE_PATTERNS:
+                match = pattern.search(prompt.lower())
                 if match:
                     recipients_text = match.group(1).strip()
                     message = match.group(2).strip()
@@ -1755,7 +1736,7 @@ def execute():
                     has_email = any(is_email_address(r) for r in recipients)
                     
                     if has_phone or has_email:
-                        print(f"[MIXED MESSAGING] Detected mixed recipients: {recipients}")
+                        log.info("[MIXED MESSAGING] Detected mixed recipients: %s", recipients)
                         result = send_mixed_messages(recipients, message, enhance=True)
                         
                         # Format response
@@ -1807,6 +1788,45 @@ def execute():
     except Exception as e:
         return jsonify({"response": f"Unexpected error: {str(e)}"}), 500
 
+@app.route('/execute_batch', methods=['POST'])
+def execute_batch():
+    """Interpret several commands with one Claude call and dispatch them concurrently"""
+    try:
+        data = request.json or {}
+        texts = data.get("texts", [])
+        
+        if not texts or not isinstance(texts, list):
+            return jsonify({"error": "'texts' must be a non-empty list"}), 400
+        
+        if len(texts) > MAX_BATCH_COMMANDS:
+            return jsonify({"error": f"At most {MAX_BATCH_COMMANDS} commands per batch"}), 400
+        
+        # Same rule as /execute: anything but a non-blank string is rejected before any Claude call
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip():
+                return jsonify({"error": f"Command {index} must be a non-empty string. Please enter a command."}), 400
+        
+        texts = [text.strip() for text in texts]
+        
+        actions = call_claude_batch(texts)
+        
+        # Dispatch independent actions concurrently; map() keeps the input order
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(
+                lambda action: action["error"] if "error" in action else dispatch_action(action),
+                actions
+            ))
+        
+        return jsonify({
+            "results": [
+                {"text": text, "response": response, "claude_output": action}
+                for text, response, action in zip(texts, responses, actions)
+            ]
+        })
+
+    except Exception as e:
+        return jsonify({"response": f"Unexpected error: {str(e)}"}), 500
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -1988,12 +2008,14 @@ def email_info():
     return jsonify(result)
 
 if __name__ == '__main__':
+    warm_claude_connection()
+    twilio_client.warm_connection()
     print("🚀 Starting Enhanced Smart AI Agent Flask App with SMS & Email Support")
     print(f"📱 Twilio Status: {'✅ Connected' if twilio_client.client else '❌ Not configured'}")
     print(f"📧 Email Status: {'✅ Configured' if email_client.email_address and email_client.email_password else '❌ Not configured'}")
     print(f"🤖 Claude Status: {'✅ Configured' if CONFIG['claude_api_key'] else '❌ Not configured'}")
     print("✨ Features: Multi-Recipient SMS, Multi-Recipient Email, Mixed Messaging, Professional Voice Processing, Message Enhancement, Auto-Subject Generation")
-    print("🔧 Execution order: Email → Multi-Email → SMS → Multi-SMS → Mixed → Claude fallback")
+    print("🔧 Execution order: Shortcut (task:/log:) → Email → Multi-Email → SMS → Multi-SMS → Mixed → Claude fallback")
     print("\\n📋 Voice Command Examples:")
     print("  📱 SMS Commands:")
     print("    • 'Text 8136414177 saying hey how are you'")
@@ -2028,4 +2050,7 @@ if __name__ == '__main__':
     print("  - Test connection with: curl http://localhost:10000/email_info")
     
     port = int(os.environ.get("PORT", 10000))
+    # Turn SIGTERM into a normal exit so atexit hooks flush queued logs and close
+    # pooled connections (gunicorn installs its own handlers and exits cleanly)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     app.run(host="0.0.0.0", port=port, debug=True)
@@ -1,13 +1,30 @@
 # Enhanced Flask Wake Word App - SMS, Email, CRM & RCS with HubSpot Integration
 # Complete CRM Co-Pilot with Twilio RCS Support - FIXED VERSION
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 import re
+import copy
+import gzip
+import hashlib
+import threading
+import concurrent.futures
+import time
+import atexit
+import logging
+import queue
+import random
+import signal
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
 
 # Import Twilio REST API client
 try:
@@ -17,13 +34,84 @@ except ImportError:
     TWILIO_AVAILABLE = False
     print("Twilio library not installed. Run: pip install twilio")
 
+# Import orjson if available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("orjson not installed, using stdlib json. Run: pip install orjson")
+
+# Import brotli if available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # Import email libraries
 import smtplib
 import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+# ==================== LOGGING ====================
+
+# Records are queued and written to stdout by a background thread
+log = logging.getLogger("crm_autopilot")
+log.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+log.propagate = False
+log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+log.addHandler(QueueHandler(log_queue))
+log_stream_handler = logging.StreamHandler(sys.stdout)
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+log_listener: Optional[QueueListener] = None
+log_listener_pid: Optional[int] = None
+
+def start_log_listener() -> None:
+    """Start the log writer thread for this process"""
+    global log_listener, log_listener_pid
+    if log_listener_pid == os.getpid():
+        return
+    log_listener = QueueListener(log_queue, log_stream_handler)
+    log_listener.start()
+    log_listener_pid = os.getpid()
+
+def stop_log_listener() -> None:
+    """Flush and stop the log writer thread"""
+    if log_listener is not None and log_listener_pid == os.getpid():
+        log_listener.stop()
+
+start_log_listener()
+atexit.register(stop_log_listener)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 CORS(app)
 
 CONFIG = {
@@ -129,7 +217,7 @@ class HubSpotService:
             )
             
             if response.status_code in [200, 201]:
-                contact = response.json()
+                contact = json_loads(response.content)
                 return {
                     "success": True,
                     "message": f"Contact created: {name}",
@@ -172,7 +260,7 @@ class HubSpotService:
             )
             
             if response.status_code == 200:
-                results = response.json()
+                results = json_loads(response.content)
                 contacts = results.get("results", [])
                 
                 if contacts:
@@ -205,7 +293,7 @@ class HubSpotService:
                 return {
                     "success": True,
                     "message": "Contact updated successfully",
-                    "data": response.json()
+                    "data": json_loads(response.content)
                 }
             else:
                 return {"success": False, "error": f"Failed to update contact: {response.text}"}
@@ -241,7 +329,7 @@ class HubSpotService:
                     return {
                         "success": True,
                         "message": f"✅ Note saved",
-                        "data": response.json()
+                        "data": json_loads(response.content)
                     }
                 else:
                     return {"success": False, "error": f"Failed to create note: {response.text[:200]}"}
@@ -256,7 +344,7 @@ class HubSpotService:
                 )
                 
                 if get_response.status_code == 200:
-                    contact_data = get_response.json()
+                    contact_data = json_loads(get_response.content)
                     props = contact_data.get("properties", {})
                     firstname = props.get("firstname", "")
                     lastname = props.get("lastname", "")
@@ -284,7 +372,7 @@ class HubSpotService:
                     return {
                         "success": True,
                         "message": f"✅ Note saved",
-                        "data": deal_response.json()
+                        "data": json_loads(deal_response.content)
                     }
                 else:
                     return {"success": False, "error": f"Failed to create note: {deal_response.text[:200]}"}
@@ -335,7 +423,7 @@ class HubSpotService:
                 return {
                     "success": True,
                     "message": f"Meeting scheduled: {title}",
-                    "data": response.json()
+                    "data": json_loads(response.content)
                 }
             else:
                 return {"success": False, "error": f"Failed to schedule meeting: {response.text}"}
@@ -380,7 +468,7 @@ class HubSpotService:
             )
             
             if response.status_code == 200:
-                results = response.json()
+                results = json_loads(response.content)
                 deals = results.get("results", [])
                 
                 # Format as calendar events
@@ -451,7 +539,7 @@ class HubSpotService:
                 return {
                     "success": True,
                     "message": f"Deal created: {name}",
-                    "data": response.json()
+                    "data": json_loads(response.content)
                 }
             else:
                 return {"success": False, "error": f"Failed to create deal: {response.text}"}
@@ -477,7 +565,7 @@ class HubSpotService:
             )
             
             if response.status_code == 200:
-                results = response.json()
+                results = json_loads(response.content)
                 deals = results.get("results", [])
                 
                 total_value = 0
@@ -542,7 +630,7 @@ class HubSpotService:
             )
             
             if response.status_code == 200:
-                results = response.json()
+                results = json_loads(response.content)
                 deals = results.get("results", [])
                 
                 if deals:
@@ -622,7 +710,7 @@ class EnhancedTwilioClient:
             return True  # Assume RCS is available and fallback if needed
             
         except Exception as e:
-            print(f"RCS capability check failed: {e}")
+            log.warning("RCS capability check failed: %s", e)
             return False
     
     def send_rcs_message(
@@ -673,7 +761,7 @@ class EnhancedTwilioClient:
             
         except Exception as e:
             # Fallback to SMS if RCS fails
-            print(f"RCS failed, falling back to SMS: {e}")
+            log.warning("RCS failed, falling back to SMS: %s", e)
             return self.send_sms(to, message)
     
     def send_sms(self, to: str, message: str) -> Dict[str, Any]:
@@ -714,11 +802,11 @@ class EnhancedTwilioClient:
         if self.rcs_agent_id and self.messaging_service_sid:
             # Check if recipient supports RCS
             if self.check_rcs_capability(to):
-                print(f"📱 Sending RCS message to {to}")
+                log.info("📱 Sending RCS message to %s", to)
                 return self.send_rcs_message(to, message, **rcs_options)
         
         # Fallback to SMS
-        print(f"📱 Sending SMS message to {to}")
+        log.info("📱 Sending SMS message to %s", to)
         return self.send_sms(to, message)
     
     def send_crm_notification(self, contact_data: Dict, message: str, 
@@ -793,7 +881,7 @@ class EnhancedTwilioClient:
             
         except Exception as e:
             # Fallback to SMS
-            print(f"RCS menu failed, falling back to SMS: {e}")
+            log.warning("RCS menu failed, falling back to SMS: %s", e)
             sms_menu = f"{menu_title}\n"
             for i, option in enumerate(options, 1):
                 sms_menu += f"{i}. {option.get('title', '')}\n"
@@ -1233,7 +1321,7 @@ def extract_email_command(text: str) -> Optional[Dict[str, Any]]:
     fixed_text = fix_email_addresses(text)
     
     if original_text != fixed_text:
-        print(f"📧 Email fix applied: {original_text} -> {fixed_text}")
+        log.info("📧 Email fix applied: %s -> %s", original_text, fixed_text)
     
     patterns = [
         r'email (.+?) (?:with )?subject (.+?) saying (.+?)(?:\s+then\s+.+)?$',
@@ -1384,25 +1472,34 @@ def extract_sms_command(text: str) -> Optional[Dict[str, Any]]:
     
     return None
 
+# Phone number patterns
+PHONE_SEPARATOR_PATTERN = re.compile(r"[ ().-]")
+PHONE_NUMBER_PATTERN = re.compile(r"\+\d+|\d{10,}")
+# Deletes ASCII characters other than digits and '+'
+PHONE_NON_DIGIT_ASCII_TABLE = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not chr(c).isdigit() and chr(c) != "+"
+))
+
 def is_phone_number(recipient: str) -> bool:
     """Check if recipient looks like a phone number"""
-    clean = recipient.replace(" ", "").replace("-", "").replace("(", "").replace(")", "").replace(".", "")
-    
-    if clean.startswith("+") and clean[1:].isdigit():
-        return True
-    if clean.isdigit() and len(clean) >= 10:
-        return True
-    
-    return False
+    return PHONE_NUMBER_PATTERN.fullmatch(PHONE_SEPARATOR_PATTERN.sub("", recipient)) is not None
 
 def is_email_address(recipient: str) -> bool:
     """Check if recipient looks like an email address"""
     email = recipient.strip()
     return '@' in email and '.' in email.split('@')[-1] and len(email.split('@')) == 2
 
+def clean_phone_digits(phone: str) -> str:
+    """Keep only digits and '+'"""
+    clean = phone.translate(PHONE_NON_DIGIT_ASCII_TABLE)
+    if not clean.isascii():
+        # Non-ASCII separators (NBSP, U+2011, U+202F) need the Unicode-aware filter
+        clean = ''.join(c for c in clean if c.isdigit() or c == '+')
+    return clean
+
 def validate_phone_number(phone: str) -> bool:
     """Validate phone number format"""
-    clean = ''.join(c for c in phone if c.isdigit() or c == '+')
+    clean = clean_phone_digits(phone)
     
     # Check for valid formats
     if clean.startswith('+1') and len(clean) == 12:
@@ -1416,7 +1513,7 @@ def validate_phone_number(phone: str) -> bool:
 
 def format_phone_number(phone: str) -> str:
     """Format phone number to E.164 format"""
-    clean = ''.join(c for c in phone if c.isdigit() or c == '+')
+    clean = clean_phone_digits(phone)
     
     # Validate before formatting
     if not validate_phone_number(clean):
@@ -1530,60 +1627,60 @@ class WakeWordProcessor:
         rcs_command = extract_rcs_command(command_text)
         if rcs_command:
             rcs_command["wake_word_info"] = wake_result
-            print(f"📱 RCS command: {rcs_command.get('action')}")
+            log.info("📱 RCS command: %s", rcs_command.get('action'))
             return rcs_command
         
         # Try SMS command (moved up to process before email)
         sms_command = extract_sms_command(command_text)
         if sms_command:
             sms_command["wake_word_info"] = wake_result
-            print(f"📱 SMS command: {sms_command.get('action')}")
+            log.info("📱 SMS command: %s", sms_command.get('action'))
             return sms_command
         
         # Try CRM pipeline commands
         pipeline_command = extract_crm_pipeline_command(command_text)
         if pipeline_command:
             pipeline_command["wake_word_info"] = wake_result
-            print(f"📊 CRM Pipeline command: {pipeline_command.get('action')}")
+            log.info("📊 CRM Pipeline command: %s", pipeline_command.get('action'))
             return pipeline_command
         
         # Try CRM contact commands
         contact_command = extract_crm_contact_command(command_text)
         if contact_command:
             contact_command["wake_word_info"] = wake_result
-            print(f"🏢 CRM Contact command: {contact_command.get('action')}")
+            log.info("🏢 CRM Contact command: %s", contact_command.get('action'))
             return contact_command
         
         # Try CRM task commands
         task_command = extract_crm_task_command(command_text)
         if task_command:
             task_command["wake_word_info"] = wake_result
-            print(f"📋 CRM Task command: {task_command.get('action')}")
+            log.info("📋 CRM Task command: %s", task_command.get('action'))
             return task_command
         
         # Try CRM calendar commands
         calendar_command = extract_crm_calendar_command(command_text)
         if calendar_command:
             calendar_command["wake_word_info"] = wake_result
-            print(f"📅 CRM Calendar command: {calendar_command.get('action')}")
+            log.info("📅 CRM Calendar command: %s", calendar_command.get('action'))
             return calendar_command
         
         # Try email command (moved after SMS)
         email_command = extract_email_command(command_text)
         if email_command:
             email_command["wake_word_info"] = wake_result
-            print(f"📧 Email command: {email_command.get('action')}")
+            log.info("📧 Email command: %s", email_command.get('action'))
             return email_command
         
         # Fallback to Claude
         try:
-            print(f"🤖 Falling back to Claude for command: {command_text}")
+            log.info("🤖 Falling back to Claude for command: %s", command_text)
             claude_result = call_claude(command_text)
             if claude_result and "error" not in claude_result:
                 claude_result["wake_word_info"] = wake_result
                 return claude_result
         except Exception as e:
-            print(f"Claude error: {e}")
+            log.error("Claude error: %s", e)
         
         return {
             "success": False,
@@ -1592,16 +1689,45 @@ class WakeWordProcessor:
 
 # ==================== HELPER FUNCTIONS ====================
 
-def call_claude(prompt):
-    """Simple Claude API call"""
+# Claude request constants
+CLAUDE_API_URL = "https://api.anthropic.com/v1/messages"
+CLAUDE_HEADERS = {
+    "x-api-key": CONFIG["claude_api_key"],
+    "anthropic-version": "2023-06-01",
+    "content-type": "application/json"
+}
+
+# Shared Claude session (keep-alive + retries)
+claude_session = requests.Session()
+claude_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"})
+    )
+))
+atexit.register(claude_session.close)
+
+# 429/529 are retried by fetch_claude_action, honoring Retry-After
+CLAUDE_RATE_LIMIT_STATUSES = frozenset({429, 529})
+CLAUDE_MAX_RETRIES = int(os.getenv("CLAUDE_MAX_RETRIES", "4"))
+CLAUDE_MAX_BACKOFF = 30.0  # seconds
+
+def claude_retry_delay(res: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited Claude request"""
     try:
-        headers = {
-            "x-api-key": CONFIG["claude_api_key"],
-            "anthropic-version": "2023-06-01",
-            "content-type": "application/json"
-        }
-        
-        instruction_prompt = """
+        delay = float(res.headers.get("retry-after", ""))
+    except ValueError:
+        delay = 2 ** attempt + random.uniform(0, 0.5)
+    return min(delay, CLAUDE_MAX_BACKOFF)
+
+# Limit concurrent Claude calls per process
+claude_semaphore = threading.BoundedSemaphore(int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8")))
+
+INSTRUCTION_PROMPT = """
 You are an intelligent assistant. Respond ONLY with valid JSON using one of the supported actions.
 
 Supported actions:
@@ -1616,28 +1742,166 @@ Response structure examples:
 {"action": "send_email", "recipient": "email", "subject": "subject", "message": "body"}
 {"action": "create_contact", "name": "Full Name", "email": "email", "phone": "phone"}
 """
-        
-        full_prompt = f"{instruction_prompt}\n\nUser: {prompt}"
 
-        body = {
-            "model": "claude-3-haiku-20240307",
-            "max_tokens": 500,
-            "temperature": 0.3,
-            "messages": [{"role": "user", "content": full_prompt}]
-        }
-
-        res = requests.post("https://api.anthropic.com/v1/messages", headers=headers, data=json.dumps(body))
-        response_json = res.json()
-        
-        if "content" in response_json:
-            raw_text = response_json["content"][0]["text"]
-            parsed = json.loads(raw_text)
-            return parsed
+# Instructions as a cacheable system prompt
+INSTRUCTION_SYSTEM = [{"type": "text", "text": INSTRUCTION_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+# Claude result cache: (date, prompt) -> (expires_at, action)
+CLAUDE_CACHE_SIZE = int(os.getenv("CLAUDE_CACHE_SIZE", "1024"))
+CLAUDE_CACHE_TTL = float(os.getenv("CLAUDE_CACHE_TTL", "3600"))
+claude_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+claude_cache_lock = threading.Lock()
+
+# Request body serialized once; only the prompt is spliced in
+CLAUDE_BODY_PREFIX, CLAUDE_BODY_SUFFIX = json_dumps({
+    "model": "claude-3-haiku-20240307",
+    "max_tokens": 500,
+    "temperature": 0.3,
+    "stream": True,
+    "system": INSTRUCTION_SYSTEM,
+    "messages": [{"role": "user", "content": ""}]
+}).split(b'"content":""', 1)
+CLAUDE_BODY_PREFIX += b'"content":'
+
+def read_claude_stream(res: requests.Response):
+    """Yield text deltas from a streaming Claude response"""
+    with res:
+        if res.status_code != 200:
+            try:
+                message = json_loads(res.content)["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                message = res.text[:200]
+            raise RuntimeError(f"Claude API error ({res.status_code}): {message}")
+        
+        event_name = b""
+        for line in res.iter_lines():
+            if line.startswith(b"event: "):
+                event_name = line[7:]
+            elif not line.startswith(b"data: "):
+                continue
+            elif event_name == b"content_block_delta":
+                yield json_loads(line[6:])["delta"].get("text", "")
+            elif event_name == b"message_start":
+                usage = json_loads(line[6:])["message"].get("usage", {})
+                cache_read = usage.get("cache_read_input_tokens", 0)
+                cache_write = usage.get("cache_creation_input_tokens", 0)
+                if cache_read or cache_write:
+                    log.info("🤖 Claude prompt cache: %s tokens read, %s tokens written", cache_read, cache_write)
+            elif event_name == b"message_stop":
+                return
+            elif event_name == b"error":
+                error = json_loads(line[6:]).get("error", {})
+                raise RuntimeError(f"Claude stream error: {error.get('message', 'unknown error')}")
+
+def collect_action_text(chunks) -> str:
+    """Join streamed text up to the end of the first JSON object"""
+    parts = []
+    depth, in_string, escaped, complete = 0, False, False, False
+    try:
+        for chunk in chunks:
+            if complete:
+                # Don't wait for text after the action
+                if chunk:
+                    break
+                continue
+            for i, ch in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}" and depth:
+                    depth -= 1
+                    if depth == 0:
+                        complete = True
+                        chunk = chunk[:i + 1]
+                        break
+            parts.append(chunk)
+    finally:
+        chunks.close()
+    return "".join(parts)
+
+# Duplicate in-flight prompts share one Claude call
+claude_inflight: Dict[tuple, concurrent.futures.Future] = {}
+claude_inflight_lock = threading.Lock()
+
+def coalesce_claude_call(key: tuple, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run fetch once per key; concurrent callers wait for its result"""
+    with claude_inflight_lock:
+        future = claude_inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = concurrent.futures.Future()
+            claude_inflight[key] = future
+    
+    if not is_owner:
+        # Waiters get their own copy
+        return copy.deepcopy(future.result())
+    
+    try:
+        result = fetch()
+        future.set_result(copy.deepcopy(result))
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with claude_inflight_lock:
+            claude_inflight.pop(key, None)
+
+def fetch_claude_action(prompt: str) -> Dict[str, Any]:
+    """Stream one action from Claude and parse it"""
+    try:
+        payload = CLAUDE_BODY_PREFIX + json_dumps(prompt) + CLAUDE_BODY_SUFFIX
+
+        # Stream so the action is parsed as soon as it is complete
+        with claude_semaphore:
+            for attempt in range(CLAUDE_MAX_RETRIES + 1):
+                res = claude_session.post(CLAUDE_API_URL, headers=CLAUDE_HEADERS, data=payload,
+                                          timeout=(3.05, 30), stream=True)
+                if res.status_code not in CLAUDE_RATE_LIMIT_STATUSES or attempt == CLAUDE_MAX_RETRIES:
+                    break
+                delay = claude_retry_delay(res, attempt)
+                res.close()
+                log.warning("🤖 Claude rate limited (%s), retrying in %.1fs", res.status_code, delay)
+                time.sleep(delay)
+            raw_text = collect_action_text(read_claude_stream(res))
+        
+        if raw_text.strip():
+            return json_loads(raw_text)
         else:
             return {"error": "Claude response missing content."}
     except Exception as e:
         return {"error": str(e)}
 
+def call_claude(prompt):
+    """Simple Claude API call"""
+    prompt = " ".join(prompt.split())
+    key = (datetime.now().date().isoformat(), prompt)
+    with claude_cache_lock:
+        if key in claude_cache:
+            expires_at, cached = claude_cache[key]
+            if expires_at > time.monotonic():
+                claude_cache.move_to_end(key)
+                # Callers modify the result, so return a copy
+                return copy.deepcopy(cached)
+            del claude_cache[key]
+    
+    result = coalesce_claude_call(key, lambda: fetch_claude_action(prompt))
+    if "error" not in result:
+        with claude_cache_lock:
+            claude_cache[key] = (time.monotonic() + CLAUDE_CACHE_TTL, copy.deepcopy(result))
+            if len(claude_cache) > CLAUDE_CACHE_SIZE:
+                claude_cache.popitem(last=False)
+    return result
+
+
 # ==================== ACTION HANDLERS ====================
 
 def handle_send_rcs_message(data):
@@ -2230,7 +2494,7 @@ def handle_update_contact_phone(data):
         if not name or not phone:
             return "❌ Both contact name and phone number are required"
         
-        print(f"🔍 Searching for contact: '{name}'")
+        log.info("🔍 Searching for contact: '%s'", name)
         
         # Search for contact
         search_result = hubspot_service.search_contact(name)
@@ -2255,7 +2519,7 @@ def handle_update_contact_phone(data):
         if not current_name:
             current_name = name
         
-        print(f"✅ Found contact: {current_name} (ID: {contact_id})")
+        log.info("✅ Found contact: %s (ID: %s)", current_name, contact_id)
         
         # Update the contact
         update_result = hubspot_service.update_contact(contact_id, {"phone": phone})
@@ -2267,7 +2531,7 @@ def handle_update_contact_phone(data):
             return f"❌ Failed to update phone for {current_name}: {error_msg}"
     
     except Exception as e:
-        print(f"❌ Error in handle_update_contact_phone: {str(e)}")
+        log.error("❌ Error in handle_update_contact_phone: %s", e)
         return f"❌ Error updating contact: {str(e)}"
 
 def handle_update_contact_email(data):
@@ -2279,7 +2543,7 @@ def handle_update_contact_email(data):
         if not name or not email:
             return "❌ Both contact name and email address are required"
         
-        print(f"🔍 Searching for contact: '{name}'")
+        log.info("🔍 Searching for contact: '%s'", name)
         
         # Search for contact
         search_result = hubspot_service.search_contact(name)
@@ -2304,7 +2568,7 @@ def handle_update_contact_email(data):
         if not current_name:
             current_name = name
         
-        print(f"✅ Found contact: {current_name} (ID: {contact_id})")
+        log.info("✅ Found contact: %s (ID: %s)", current_name, contact_id)
         
         # Update the contact
         update_result = hubspot_service.update_contact(contact_id, {"email": email})
@@ -2316,7 +2580,7 @@ def handle_update_contact_email(data):
             return f"❌ Failed to update email for {current_name}: {error_msg}"
     
     except Exception as e:
-        print(f"❌ Error in handle_update_contact_email: {str(e)}")
+        log.error("❌ Error in handle_update_contact_email: %s", e)
         return f"❌ Error updating contact: {str(e)}"
 
 def handle_update_contact_company(data):
@@ -2380,7 +2644,7 @@ def handle_add_contact_note(data):
             if create_result.get("success"):
                 contact_id = create_result.get("contact_id", "")
                 contact_found = True
-                print(f"✅ Created new contact '{name}' for note")
+                log.info("✅ Created new contact '%s' for note", name)
         
         # Now add the note
         note_result = hubspot_service.add_contact_note(contact_id, note)
@@ -2556,71 +2820,52 @@ def handle_show_contact_deals(data):
 
 # ==================== ACTION DISPATCHER ====================
 
+def handle_unsupported_feature(data):
+    """Handle commands Claude flagged as unsupported"""
+    return data.get("message", "This feature is not currently supported")
+
+# Action name -> handler
+ACTION_HANDLERS = {
+    "unsupported_feature": handle_unsupported_feature,
+    # RCS-specific actions
+    "send_rcs_message": handle_send_rcs_message,
+    "send_interactive_menu": handle_send_interactive_menu,
+    "send_crm_notification": handle_send_crm_notification,
+    # Communication actions
+    "send_message": handle_send_message,
+    "send_message_to_contact": handle_send_message_to_contact,
+    "send_email": handle_send_email,
+    "send_email_to_contact": handle_send_email_to_contact,
+    "send_email_to_multiple_contacts": handle_send_email_to_multiple_contacts,
+    # CRM Contact actions
+    "create_contact": handle_create_contact,
+    "update_contact_phone": handle_update_contact_phone,
+    "update_contact_email": handle_update_contact_email,
+    "update_contact_company": handle_update_contact_company,
+    "add_contact_note": handle_add_contact_note,
+    "search_contact": handle_search_contact,
+    # CRM Task actions
+    "create_task": handle_create_task,
+    # CRM Calendar actions
+    "schedule_meeting": handle_schedule_meeting,
+    "show_calendar": handle_show_calendar,
+    # CRM Pipeline actions
+    "create_opportunity": handle_create_opportunity,
+    "show_pipeline_summary": handle_show_pipeline_summary,
+    "show_contact_deals": handle_show_contact_deals,
+}
+
 def dispatch_action(parsed):
     """Enhanced action dispatcher with all fixes"""
     try:
         action = parsed.get("action")
-        print(f"🔧 Dispatching action: '{action}'")
-        
-        # Handle special/unsupported commands
-        if action == "unsupported_feature":
-            return parsed.get("message", "This feature is not currently supported")
-        
-        # RCS-specific actions
-        elif action == "send_rcs_message":
-            return handle_send_rcs_message(parsed)
-        elif action == "send_interactive_menu":
-            return handle_send_interactive_menu(parsed)
-        elif action == "send_crm_notification":
-            return handle_send_crm_notification(parsed)
-        
-        # Communication actions
-        elif action == "send_message":
-            return handle_send_message(parsed)
-        elif action == "send_message_to_contact":
-            return handle_send_message_to_contact(parsed)
-        elif action == "send_email":
-            return handle_send_email(parsed)
-        elif action == "send_email_to_contact":
-            return handle_send_email_to_contact(parsed)
-        elif action == "send_email_to_multiple_contacts":
-            return handle_send_email_to_multiple_contacts(parsed)
-        
-        # CRM Contact actions
-        elif action == "create_contact":
-            return handle_create_contact(parsed)
-        elif action == "update_contact_phone":
-            return handle_update_contact_phone(parsed)
-        elif action == "update_contact_email":
-            return handle_update_contact_email(parsed)
-        elif action == "update_contact_company":
-            return handle_update_contact_company(parsed)
-        elif action == "add_contact_note":
-            return handle_add_contact_note(parsed)
-        elif action == "search_contact":
-            return handle_search_contact(parsed)
-        
-        # CRM Task actions
-        elif action == "create_task":
-            return handle_create_task(parsed)
-        
-        # CRM Calendar actions
-        elif action == "schedule_meeting":
-            return handle_schedule_meeting(parsed)
-        elif action == "show_calendar":
-            return handle_show_calendar(parsed)
-        
-        # CRM Pipeline actions
-        elif action == "create_opportunity":
-            return handle_create_opportunity(parsed)
-        elif action == "show_pipeline_summary":
-            return handle_show_pipeline_summary(parsed)
-        elif action == "show_contact_deals":
-            return handle_show_contact_deals(parsed)
+        log.info("🔧 Dispatching action: '%s'", action)
         
-        else:
-            print(f"❌ Unknown action received: '{action}'")
+        handler = ACTION_HANDLERS.get(action)
+        if handler is None:
+            log.warning("❌ Unknown action received: '%s'", action)
             return f"Unknown action: {action}. Supported: SMS, RCS, Email, CRM Contact/Task/Calendar/Pipeline operations"
+        return handler(parsed)
     except Exception as e:
         return f"❌ Error in dispatch: {str(e)}"
 
@@ -3196,9 +3441,31 @@ def send_rcs():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Page rendered and compressed once at startup
+HTML_BODY = get_html_template().encode("utf-8")
+HTML_VARIANTS = {
+    "identity": HTML_BODY,
+    "gzip": gzip.compress(HTML_BODY, compresslevel=9, mtime=0),
+}
+if BROTLI_AVAILABLE:
+    HTML_VARIANTS["br"] = brotli.compress(HTML_BODY, quality=11)
+HTML_ENCODINGS = [e for e in ("br", "gzip") if e in HTML_VARIANTS]
+HTML_ETAGS = {encoding: hashlib.blake2b(body, digest_size=8).hexdigest() for encoding, body in HTML_VARIANTS.items()}
+
 @app.route("/")
 def root():
-    return get_html_template()
+    encoding = request.accept_encodings.best_match(HTML_ENCODINGS, default="identity")
+    etag = HTML_ETAGS[encoding]
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(HTML_VARIANTS[encoding], mimetype="text/html")
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
 
 @app.route('/favicon.ico')
 def favicon():
@@ -3241,7 +3508,7 @@ def handle_rcs_webhook():
     """Handle RCS message responses and interactions"""
     try:
         data = request.json
-        print(f"📱 RCS Webhook received: {json.dumps(data, indent=2)}")
+        log.info("📱 RCS Webhook received: %s", data)
         
         # Handle button clicks
         if data.get('PostbackData'):
@@ -3303,7 +3570,7 @@ def handle_rcs_webhook():
         return jsonify({"status": "received"}), 200
         
     except Exception as e:
-        print(f"❌ RCS Webhook error: {str(e)}")
+        log.error("❌ RCS Webhook error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/test-email', methods=['POST'])
@@ -3640,4 +3907,7 @@ if __name__ == '__main__':
     print(f"🔗 Access the app at: http://0.0.0.0:{port}")
     print("=" * 60 + "\n")
     
+    # Exit normally on SIGTERM so atexit cleanup runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     app.run(host="0.0.0.0", port=port, debug=False)    
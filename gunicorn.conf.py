@@ -0,0 +1,38 @@
+# Gunicorn settings for production: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+
+# /execute spends almost all of its time waiting on Claude, Twilio or SMTP, so use
+# threaded workers and size workers * threads to the expected concurrent requests.
+# GUNICORN_WORKER_CLASS=gevent (with gevent installed) trades threads for greenlets,
+# bounded per worker by worker_connections.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", "32"))
+
+# Backpressure: each worker holds at most worker_connections clients (idle keep-alive
+# ones included); beyond that, connections wait in the listen backlog instead of
+# piling more work onto busy threads
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+backlog = int(os.getenv("GUNICORN_BACKLOG", "2048"))
+
+# Import the app once in the master so module-level constants (precompressed static
+# assets, prompt blocks, compiled patterns) are shared copy-on-write by every worker.
+# Network connections are only opened after the fork, in post_worker_init.
+# Green workers monkey-patch sockets and locks after the fork, so for them the app
+# is imported in each worker instead, after patching.
+preload_app = worker_class not in ("gevent", "eventlet")
+
+# Claude calls retry with backoff, so allow well over the 30s read timeout
+timeout = 120
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Start the worker's log writer and pre-open the Claude and Twilio connections before it takes traffic"""
+    from app import start_log_listener, twilio_client, warm_claude_connection
+    start_log_listener()
+    warm_claude_connection()
+    twilio_client.warm_connection()